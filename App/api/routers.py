@@ -2,13 +2,15 @@
 FastAPI routes for RAG API.
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from app.models.schemas import (
     QueryRequest, QueryResponse, ContextItem,
     AskRequest, AskResponse, HealthResponse
 )
 from app.rag.retriever import retrieve, retrieve_with_scores
+from app.rag.chain import generate_answer, generate_answer_map_reduce
 from app.core.config import get_settings
+from app.core.metrics import REQUEST_ERRORS, timed
 
 router = APIRouter()
 
@@ -51,24 +53,31 @@ async def query_vectorstore(
         QueryResponse with relevant contexts
     """
     try:
-        docs_with_scores = retrieve_with_scores(request.query, store, k=request.k)
+        docs_with_scores = retrieve_with_scores(
+            request.query, store, k=request.k, **request.retrieval_kwargs()
+        )
         
-        contexts = [
-            ContextItem(
-                content=doc.page_content,
-                metadata=doc.metadata,
-                score=float(score)
+        with timed("serialization"):
+            contexts = [
+                ContextItem(
+                    content=doc.page_content,
+                    metadata=doc.metadata,
+                    score=float(score)
+                )
+                for doc, score in docs_with_scores
+            ]
+            
+            response = QueryResponse(
+                query=request.query,
+                contexts=contexts,
+                count=len(contexts)
             )
-            for doc, score in docs_with_scores
-        ]
-        
-        return QueryResponse(
-            query=request.query,
-            contexts=contexts,
-            count=len(contexts)
-        )
+            
+            # Encode here so the timing covers JSON serialization too
+            return Response(content=response.model_dump_json(), media_type="application/json")
     
     except Exception as e:
+        REQUEST_ERRORS.labels(endpoint="query").inc()
         raise HTTPException(status_code=500, detail=f"Retrieval error: {str(e)}")
 
 
@@ -88,30 +97,46 @@ async def ask_question(
     """
     from app.main import app
     
-    if not hasattr(app.state, 'rag_chain') or app.state.rag_chain is None:
-        raise HTTPException(status_code=503, detail="RAG chain not initialized")
+    if not hasattr(app.state, 'llm') or app.state.llm is None:
+        raise HTTPException(status_code=503, detail="LLM not initialized")
     
     try:
         # Retrieve contexts
-        docs_with_scores = retrieve_with_scores(request.question, store, k=request.k)
+        docs_with_scores = retrieve_with_scores(
+            request.question, store, k=request.k, **request.retrieval_kwargs()
+        )
         
-        contexts = [
-            ContextItem(
-                content=doc.page_content,
-                metadata=doc.metadata,
-                score=float(score)
+        # Generate answer from the same contexts
+        docs = [doc for doc, _ in docs_with_scores]
+        if request.mode == "map_reduce":
+            answer = await generate_answer_map_reduce(
+                app.state.llm,
+                request.question,
+                docs,
+                max_concurrency=get_settings().map_reduce_concurrency,
+                min_evidence=request.min_evidence
             )
-            for doc, score in docs_with_scores
-        ]
+        else:
+            answer = await generate_answer(app.state.llm, request.question, docs)
         
-        # Generate answer
-        answer = app.state.rag_chain.run(request.question)
-        
-        return AskResponse(
-            question=request.question,
-            answer=answer,
-            contexts=contexts
-        )
+        with timed("serialization"):
+            contexts = [
+                ContextItem(
+                    content=doc.page_content,
+                    metadata=doc.metadata,
+                    score=float(score)
+                )
+                for doc, score in docs_with_scores
+            ]
+            
+            response = AskResponse(
+                question=request.question,
+                answer=answer,
+                contexts=contexts
+            )
+            
+            return Response(content=response.model_dump_json(), media_type="application/json")
     
     except Exception as e:
+        REQUEST_ERRORS.labels(endpoint="ask").inc()
         raise HTTPException(status_code=500, detail=f"RAG error: {str(e)}")
\ No newline at end of file
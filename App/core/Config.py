@@ -3,6 +3,7 @@ Configuration management using environment variables.
 """
 
 from functools import lru_cache
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 
@@ -16,10 +17,13 @@ class Settings(BaseSettings):
     # Vector store settings
     vectorstore_path: str = "./data/vectorstore"
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    embedding_batch_size: int = 32
+    embedding_max_tokens_per_batch: Optional[int] = None
     
     # LLM settings
     ollama_base_url: str = "http://localhost:11434"
     ollama_model: str = "llama3"
+    map_reduce_concurrency: int = 4
     
     # Retrieval settings
     default_k: int = 4
@@ -30,6 +34,9 @@ class Settings(BaseSettings):
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     
+    # Observability settings
+    enable_tracing: bool = False
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
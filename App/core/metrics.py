@@ -0,0 +1,174 @@
+"""
+Prometheus metrics, stage timing and optional tracing.
+"""
+
+import os
+import resource
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+
+try:
+    from opentelemetry import trace
+except ImportError:  # tracing is an optional extra
+    trace = None
+
+
+STAGE_LATENCY = Histogram(
+    "mini_rag_stage_duration_seconds",
+    "Time spent in each request stage",
+    ["stage"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+
+REQUEST_ERRORS = Counter(
+    "mini_rag_errors_total",
+    "Errors raised while serving requests",
+    ["endpoint"],
+)
+
+CACHE_HITS = Counter(
+    "mini_rag_cache_hits_total",
+    "Cache hits",
+    ["cache"],
+)
+
+CACHE_MISSES = Counter(
+    "mini_rag_cache_misses_total",
+    "Cache misses",
+    ["cache"],
+)
+
+INDEX_SIZE = Gauge(
+    "mini_rag_index_vectors",
+    "Number of vectors in the loaded index",
+    multiprocess_mode="liveall",
+)
+
+PROCESS_MEMORY = Gauge(
+    "mini_rag_process_memory_bytes",
+    "Resident memory of the serving process",
+    multiprocess_mode="liveall",
+)
+
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "request_timings", default=None
+)
+_tracing_enabled = False
+
+
+def _resident_memory() -> float:
+    """Current RSS in bytes, falling back to peak RSS off Linux."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def sample_process_memory():
+    """
+    Record this process's current RSS in the memory gauge.
+
+    A set_function callback is never written to the multiprocess files, so
+    each worker samples its RSS on every request and before rendering.
+    """
+    PROCESS_MEMORY.set(_resident_memory())
+
+
+def enable_tracing(enabled: bool = True) -> bool:
+    """
+    Turn per-stage tracing spans on or off.
+
+    Args:
+        enabled: Whether stages should open OpenTelemetry spans
+
+    Returns:
+        True if tracing is active (requires opentelemetry-api)
+    """
+    global _tracing_enabled
+    _tracing_enabled = enabled and trace is not None
+    return _tracing_enabled
+
+
+def start_request_timings() -> Dict[str, float]:
+    """
+    Start collecting stage timings for the current request.
+
+    Returns:
+        Dict that `timed` fills with stage durations in seconds
+    """
+    timings: Dict[str, float] = {}
+    _request_timings.set(timings)
+    return timings
+
+
+def record_stage(stage: str, seconds: float):
+    """
+    Record a stage duration measured elsewhere.
+
+    Args:
+        stage: Stage name (e.g. "embedding", "llm_ttft")
+        seconds: Duration in seconds
+    """
+    STAGE_LATENCY.labels(stage=stage).observe(seconds)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+@contextmanager
+def timed(stage: str):
+    """
+    Time a block of code as a named stage.
+
+    Args:
+        stage: Stage name used as histogram label and Server-Timing entry
+    """
+    span = (
+        trace.get_tracer("mini_rag").start_as_current_span(stage)
+        if _tracing_enabled
+        else nullcontext()
+    )
+    with span:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record_stage(stage, time.perf_counter() - start)
+
+
+def format_server_timing(timings: Dict[str, float]) -> str:
+    """
+    Format stage timings as a Server-Timing header value.
+
+    Args:
+        timings: Stage durations in seconds
+
+    Returns:
+        Header value such as "embedding;dur=3.1, vector_search;dur=0.4"
+    """
+    return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings.items())
+
+
+def render_metrics():
+    """
+    Render all metrics in Prometheus text format.
+
+    Under a multi-worker server with PROMETHEUS_MULTIPROC_DIR set, metrics
+    of all workers are aggregated.
+
+    Returns:
+        Tuple of (payload bytes, content type)
+    """
+    sample_process_memory()
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -2,24 +2,190 @@
 Embedding generation module using sentence-transformers.
 """
 
+import time
+from typing import List, Optional
+
 from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_core.embeddings import Embeddings
+
+
+def length_batches(
+    lengths: List[int], batch_size: int, max_tokens_per_batch: Optional[int] = None
+) -> List[List[int]]:
+    """
+    Group inputs into batches of similar length.
+    
+    Inputs are sorted longest first so each batch pads to a similar width. A
+    batch is closed at `batch_size` inputs, or earlier once its padded size
+    (inputs * longest input) would exceed `max_tokens_per_batch`.
+    
+    Args:
+        lengths: Length of each input (tokens, or characters as a proxy)
+        batch_size: Upper bound on inputs per batch
+        max_tokens_per_batch: Upper bound on padded length per batch (None = no limit)
+        
+    Returns:
+        List of batches, each a list of input indices
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+    batches = []
+    batch: List[int] = []
+    
+    for i in order:
+        # Sorted longest first, so the batch's first input sets its padded width
+        if batch and (
+            len(batch) >= batch_size
+            or (
+                max_tokens_per_batch is not None
+                and (len(batch) + 1) * max(lengths[batch[0]], 1) > max_tokens_per_batch
+            )
+        ):
+            batches.append(batch)
+            batch = []
+        batch.append(i)
+    
+    if batch:
+        batches.append(batch)
+    
+    return batches
+
+
+def prepare_texts(texts: List[str]) -> List[str]:
+    """Normalize texts the way HuggingFaceEmbeddings does before encoding."""
+    return [text.replace("\n", " ") for text in texts]
+
+
+def count_tokens(tokenizer, texts: List[str], max_seq_length: int) -> List[int]:
+    """
+    Token count of each text, capped at the model's max sequence length.
+    
+    Args:
+        tokenizer: HuggingFace tokenizer of the embedding model
+        texts: Texts to measure
+        max_seq_length: Length the model truncates inputs to
+        
+    Returns:
+        Number of tokens each text is encoded with
+    """
+    ids = tokenizer(
+        texts, add_special_tokens=True, truncation=True, max_length=max_seq_length
+    )["input_ids"]
+    return [len(i) for i in ids]
+
+
+class TrackedEmbeddings(Embeddings):
+    """Embeddings that track document encoding throughput across calls."""
+    
+    chunks_encoded = 0
+    tokens_encoded = 0
+    seconds = 0.0
+    
+    def record(self, chunks: int, tokens: int, seconds: float):
+        """Add one embed_documents call to the throughput counters."""
+        self.chunks_encoded += chunks
+        self.tokens_encoded += tokens
+        self.seconds += seconds
+    
+    def throughput(self) -> dict:
+        """
+        Encoding throughput since this instance was created.
+        
+        Returns:
+            Dict with chunks, tokens, seconds, chunks_per_sec and tokens_per_sec
+        """
+        seconds = self.seconds
+        return {
+            "chunks": self.chunks_encoded,
+            "tokens": self.tokens_encoded,
+            "seconds": round(seconds, 3),
+            "chunks_per_sec": round(self.chunks_encoded / seconds, 1) if seconds else 0.0,
+            "tokens_per_sec": round(self.tokens_encoded / seconds, 1) if seconds else 0.0,
+        }
+
+
+class BucketedEmbeddings(TrackedEmbeddings):
+    """
+    Sentence-transformers embeddings encoded in length-sorted buckets.
+    
+    Inputs are sorted by token length and grouped under a batch size and a
+    padded-tokens budget, so short chunks are not padded to the length of long
+    ones. Results come back in input order. Throughput is tracked across calls.
+    """
+    
+    def __init__(
+        self,
+        base: HuggingFaceEmbeddings,
+        batch_size: int = 32,
+        max_tokens_per_batch: Optional[int] = None
+    ):
+        """
+        Args:
+            base: Loaded HuggingFaceEmbeddings instance
+            batch_size: Upper bound on chunks per batch
+            max_tokens_per_batch: Upper bound on padded tokens per batch (None = no limit)
+        """
+        self.base = base
+        self.batch_size = batch_size
+        self.max_tokens_per_batch = max_tokens_per_batch
+    
+    def token_lengths(self, texts: List[str]) -> List[int]:
+        """Token count of each text, capped at the model's max sequence length."""
+        model = self.base.client
+        return count_tokens(model.tokenizer, texts, model.max_seq_length)
+    
+    def encode_batch(self, texts: List[str]) -> List[List[float]]:
+        """Encode prepared texts in a single forward pass."""
+        vectors = self.base.client.encode(texts, batch_size=len(texts), **self.base.encode_kwargs)
+        return [vector.tolist() for vector in vectors]
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        
+        start = time.perf_counter()
+        texts = prepare_texts(texts)
+        lengths = self.token_lengths(texts)
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        
+        for batch in length_batches(lengths, self.batch_size, self.max_tokens_per_batch):
+            vectors = self.encode_batch([texts[i] for i in batch])
+            for i, vector in zip(batch, vectors):
+                results[i] = vector
+        
+        self.record(len(texts), sum(lengths), time.perf_counter() - start)
+        return results
+    
+    def embed_query(self, text: str) -> List[float]:
+        return self.base.embed_query(text)
 
 
-def get_embedder(model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
+
+def get_embedder(
+    model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+    batch_size: int = 32,
+    max_tokens_per_batch: Optional[int] = None
+):
     """
     Initialize the embedding model.
     
     Args:
         model_name: HuggingFace model identifier
+        batch_size: Upper bound on chunks per encoding batch
+        max_tokens_per_batch: Upper bound on padded tokens per batch (None = no limit)
         
     Returns:
         Embeddings instance
     """
-    embedder = HuggingFaceEmbeddings(
+    base = HuggingFaceEmbeddings(
         model_name=model_name,
         model_kwargs={'device': 'cpu'},
         encode_kwargs={'normalize_embeddings': True}
     )
+    embedder = BucketedEmbeddings(
+        base,
+        batch_size=batch_size,
+        max_tokens_per_batch=max_tokens_per_batch
+    )
     
     print(f"Loaded embeddings model: {model_name}")
     return embedder
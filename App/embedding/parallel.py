@@ -0,0 +1,109 @@
+"""
+Multi-process embedding for ingestion throughput.
+"""
+
+import multiprocessing as mp
+import os
+import time
+from typing import List, Optional
+
+from app.embeddings.embedder import (
+    TrackedEmbeddings, count_tokens, get_embedder, length_batches, prepare_texts
+)
+
+
+_worker_embedder = None
+
+
+def _init_worker(model_name: str, threads: int):
+    """Load one model per worker process with a bounded intra-op thread count."""
+    global _worker_embedder
+    import torch
+
+    torch.set_num_threads(threads)
+    _worker_embedder = get_embedder(model_name)
+
+
+def _max_seq_length() -> int:
+    return _worker_embedder.base.client.max_seq_length
+
+
+def _encode_batch(texts: List[str]) -> List[List[float]]:
+    return _worker_embedder.encode_batch(texts)
+
+
+def _embed_query(text: str) -> List[float]:
+    return _worker_embedder.embed_query(text)
+
+
+class ParallelEmbedder(TrackedEmbeddings):
+    """
+    Embeddings backed by a pool of worker processes, each holding its own model.
+
+    The parent tokenizes inputs and builds the same length buckets a serial
+    `get_embedder` run would. Each bucket is encoded by a worker in one
+    forward pass and results are reassembled in input order, so the vectors
+    match a serial run. Throughput is measured end to end in this process,
+    across all workers.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        workers: int,
+        threads_per_worker: Optional[int] = None,
+        batch_size: int = 32,
+        max_tokens_per_batch: Optional[int] = None,
+    ):
+        """
+        Start the worker pool and load the tokenizer in this process.
+
+        Args:
+            model_name: HuggingFace model identifier
+            workers: Number of worker processes
+            threads_per_worker: Intra-op threads per worker (defaults to cores / workers)
+            batch_size: Upper bound on chunks per bucket
+            max_tokens_per_batch: Upper bound on padded tokens per bucket (None = no limit)
+        """
+        from transformers import AutoTokenizer
+
+        if threads_per_worker is None:
+            threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_tokens_per_batch = max_tokens_per_batch
+        self._pool = mp.get_context("spawn").Pool(
+            workers,
+            initializer=_init_worker,
+            initargs=(model_name, threads_per_worker)
+        )
+        self._tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self._max_seq_length = self._pool.apply(_max_seq_length)
+        print(f"Started {workers} embedding workers ({threads_per_worker} threads each)")
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+
+        start = time.perf_counter()
+        texts = prepare_texts(texts)
+        lengths = count_tokens(self._tokenizer, texts, self._max_seq_length)
+        batches = length_batches(lengths, self.batch_size, self.max_tokens_per_batch)
+        results: List[Optional[List[float]]] = [None] * len(texts)
+
+        encoded = self._pool.imap(_encode_batch, [[texts[i] for i in batch] for batch in batches])
+        for batch, vectors in zip(batches, encoded):
+            for i, vector in zip(batch, vectors):
+                results[i] = vector
+
+        self.record(len(texts), sum(lengths), time.perf_counter() - start)
+        return results
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._pool.apply(_embed_query, (text,))
+
+    def close(self):
+        """Shut down the worker pool."""
+        self._pool.close()
+        self._pool.join()
@@ -0,0 +1,55 @@
+"""
+Gunicorn configuration for multi-worker serving with pre-fork model loading.
+
+Usage:
+    gunicorn -c app/gunicorn_conf.py app.main:app
+"""
+
+import os
+
+# Answers are bound by the LLM server and each worker splits the cores for
+# embedding, so a few workers are enough; raise WEB_CONCURRENCY after measuring
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+bind = f"{os.getenv('API_HOST', '0.0.0.0')}:{os.getenv('API_PORT', '8000')}"
+
+# Import the app in the master so components can be loaded once, before fork
+preload_app = True
+timeout = 120
+
+# Clear metrics of a previous run. This has to happen when the config is read:
+# preload_app imports the app, which opens its metric files, before on_starting
+_multiproc_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+if _multiproc_dir:
+    os.makedirs(_multiproc_dir, exist_ok=True)
+    for name in os.listdir(_multiproc_dir):
+        os.remove(os.path.join(_multiproc_dir, name))
+
+
+def when_ready(server):
+    """Load the embedder, vector store and LLM in the master process."""
+    from app.main import app, preload_components
+
+    preload_components(app)
+
+    if _multiproc_dir:
+        from prometheus_client import multiprocess
+
+        # The master never serves requests; drop the zero-valued gauges it created on import
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def post_fork(server, worker):
+    """Give each worker an even share of the cores for intra-op parallelism."""
+    import torch
+
+    threads = int(os.getenv("WORKER_THREADS", max(1, (os.cpu_count() or 1) // workers)))
+    torch.set_num_threads(threads)
+
+
+def child_exit(server, worker):
+    """Drop metrics of dead workers when running in Prometheus multiprocess mode."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,263 @@
+"""
+Batched, checkpointed ingestion for large corpora.
+"""
+
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from app.ingestion.loader import load_docs
+from app.ingestion.chunker import chunk_docs
+from app.vectorstore.faiss_store import build_store_from_embeddings, load_store
+
+
+MANIFEST_NAME = "ingest_manifest.json"
+SHARDS_DIR = "shards"
+
+
+def load_manifest(store_path: str) -> Optional[dict]:
+    """
+    Load the ingestion manifest of a checkpointed run.
+
+    Args:
+        store_path: Path the vector store is saved to
+
+    Returns:
+        Manifest dict, or None if there is no checkpoint
+    """
+    path = Path(store_path) / MANIFEST_NAME
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def save_manifest(manifest: dict, store_path: str):
+    """Atomically replace the manifest."""
+    path = Path(store_path) / MANIFEST_NAME
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp, path)
+
+
+def save_shard(shard, manifest: dict, store_path: str):
+    """
+    Write the vectors added since the last checkpoint as a new shard.
+
+    Each checkpoint only writes its own shard plus the small manifest, so
+    total checkpoint I/O grows linearly with the corpus. The shard directory
+    is complete before the manifest references it.
+
+    Args:
+        shard: FAISS store holding only the new vectors
+        manifest: Ingestion progress, updated with the new shard
+        store_path: Path to save the vector store
+    """
+    name = f"shard-{len(manifest['shards']):05d}"
+    shard_dir = Path(store_path) / SHARDS_DIR / name
+    tmp = shard_dir.with_name(f"{name}.tmp")
+
+    shutil.rmtree(tmp, ignore_errors=True)
+    shutil.rmtree(shard_dir, ignore_errors=True)  # left over from an interrupted checkpoint
+    shard.save_local(str(tmp))
+    tmp.rename(shard_dir)
+
+    manifest["shards"].append(name)
+    save_manifest(manifest, store_path)
+
+
+def merge_shards(manifest: dict, store_path: str, embedder):
+    """
+    Merge all checkpointed shards into one store and save it at `store_path`.
+
+    This step is not memory-bounded: the merged index and docstore hold the
+    whole corpus (plus the shard being merged), just as loading the store
+    for serving does, because the saved format pickles one docstore.
+
+    Args:
+        manifest: Ingestion manifest listing the shards
+        store_path: Path to save the vector store
+        embedder: Embeddings instance
+
+    Returns:
+        Merged FAISS store, or None if there are no shards
+    """
+    store = None
+    for name in manifest["shards"]:
+        shard = load_store(str(Path(store_path) / SHARDS_DIR / name), embedder)
+        if store is None:
+            store = shard
+        else:
+            store.merge_from(shard)
+
+    if store is not None:
+        store.save_local(store_path)
+    return store
+
+
+def ingest_files(
+    files: List[str],
+    embedder,
+    store_path: str,
+    chunk_size: int = 800,
+    chunk_overlap: int = 150,
+    batch_size: int = 256,
+    checkpoint_every: int = 10,
+    resume: bool = False,
+    embedding_model: Optional[str] = None,
+    ocr: bool = False,
+    ocr_workers: Optional[int] = None,
+):
+    """
+    Ingest files into a FAISS store in fixed-size embedding batches.
+
+    While embedding, only one file's chunks and the vectors since the last
+    checkpoint (up to `checkpoint_every * batch_size` chunks) are held at a
+    time. Every `checkpoint_every` batches those vectors are written as an
+    append-only shard and the manifest is updated. With `resume` a run
+    continues from the last checkpoint. It skips finished files and the
+    already embedded chunks of the file it stopped in, and retries files that
+    failed to load or had pages whose OCR failed, from their first chunk. At the end all shards are merged and saved at `store_path`;
+    that merge holds the full corpus in memory (see `merge_shards`).
+
+    Args:
+        files: Paths of files to ingest, in a stable order
+        embedder: Embeddings instance
+        store_path: Path to save the vector store
+        chunk_size: Target size of each chunk in characters
+        chunk_overlap: Number of overlapping characters between chunks
+        batch_size: Number of chunks embedded per batch
+        checkpoint_every: Number of batches between checkpoints
+        resume: Continue from an existing checkpoint at `store_path`
+        embedding_model: Model name, recorded so a resume cannot mix models
+        ocr: OCR PDF pages that have no text layer (recorded like the model)
+        ocr_workers: Number of pages OCR'd at once (defaults to CPU count)
+
+    Returns:
+        FAISS vector store instance (None if nothing was ingested)
+
+    Raises:
+        ValueError: If the checkpoint was made with different settings
+    """
+    params = {
+        "chunk_size": chunk_size,
+        "chunk_overlap": chunk_overlap,
+        "embedding_model": embedding_model,
+        "ocr": ocr,
+    }
+    manifest = load_manifest(store_path) if resume else None
+
+    if manifest is None:
+        shutil.rmtree(Path(store_path) / SHARDS_DIR, ignore_errors=True)
+        (Path(store_path) / SHARDS_DIR).mkdir(parents=True, exist_ok=True)
+        manifest = {
+            "params": params,
+            "shards": [],
+            "files_done": [],
+            "files_failed": {},
+            "current_file": None,
+            "current_offset": 0,
+            "chunks_done": 0,
+            "complete": False,
+        }
+    elif manifest["params"] != params:
+        raise ValueError(
+            f"Checkpoint was created with {manifest['params']}, not {params}. "
+            "Re-run without --resume to start over."
+        )
+    else:
+        print(f"Resuming from checkpoint: {manifest['chunks_done']} chunks, "
+              f"{len(manifest['files_done'])} files done, "
+              f"{len(manifest['files_failed'])} failed files to retry")
+
+    files_done = set(manifest["files_done"])
+    shard = None
+    pending = []  # (chunk, file path, index within file, is last chunk of file)
+    batches = 0
+    start = time.perf_counter()
+    start_chunks = manifest["chunks_done"]
+
+    def checkpoint():
+        nonlocal shard
+        if shard is not None:
+            save_shard(shard, manifest, store_path)
+            shard = None
+        else:
+            save_manifest(manifest, store_path)
+
+    def flush():
+        nonlocal shard, pending, batches
+        embeddings = embedder.embed_documents([chunk.page_content for chunk, *_ in pending])
+        docs = [chunk for chunk, *_ in pending]
+
+        if shard is None:
+            shard = build_store_from_embeddings(docs, embeddings, embedder)
+        else:
+            shard.add_embeddings(
+                zip([doc.page_content for doc in docs], embeddings),
+                metadatas=[doc.metadata for doc in docs]
+            )
+
+        for _, file_path, index, is_last in pending:
+            if is_last:
+                manifest["files_done"].append(file_path)
+                manifest["current_file"], manifest["current_offset"] = None, 0
+            else:
+                manifest["current_file"], manifest["current_offset"] = file_path, index + 1
+
+        manifest["chunks_done"] += len(pending)
+        pending = []
+        batches += 1
+
+        if batches % checkpoint_every == 0:
+            checkpoint()
+            rate = (manifest["chunks_done"] - start_chunks) / (time.perf_counter() - start)
+            print(f"Checkpoint: {manifest['chunks_done']} chunks ({rate:.1f} chunks/sec)")
+
+    for file_path in files:
+        if file_path in files_done:
+            continue
+
+        try:
+            docs = load_docs(file_path, ocr=ocr, ocr_workers=ocr_workers)
+        except Exception as e:
+            # Not marked done, so a resumed run retries it
+            print(f"Error loading {file_path}: {e}")
+            manifest["files_failed"][file_path] = str(e)
+            continue
+
+        ocr_failed = [doc.metadata.get("page") for doc in docs if doc.metadata.get("ocr_failed")]
+        if ocr_failed:
+            # Re-OCR on resume changes the file's chunks, so none of them may be stored yet
+            print(f"OCR failed on pages {ocr_failed} of {file_path}; will retry on resume")
+            manifest["files_failed"][file_path] = f"OCR failed on pages {ocr_failed}"
+            continue
+        manifest["files_failed"].pop(file_path, None)
+
+        chunks = chunk_docs(docs, chunk_size=chunk_size, chunk_overlap=chunk_overlap) if docs else []
+        offset = manifest["current_offset"] if file_path == manifest["current_file"] else 0
+
+        if not chunks:
+            manifest["files_done"].append(file_path)
+            continue
+
+        for index in range(offset, len(chunks)):
+            pending.append((chunks[index], file_path, index, index == len(chunks) - 1))
+            if len(pending) >= batch_size:
+                flush()
+
+    if pending:
+        flush()
+
+    manifest["complete"] = not manifest["files_failed"]
+    checkpoint()
+    store = merge_shards(manifest, store_path, embedder)
+
+    print(f"Ingested {manifest['chunks_done']} chunks into {store_path}")
+    if manifest["files_failed"]:
+        print(f"{len(manifest['files_failed'])} files failed to load; "
+              "re-run with --resume to retry them")
+
+    return store
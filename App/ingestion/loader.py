@@ -4,16 +4,18 @@ Supports PDF, Markdown, and plain text files.
 """
 
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 from langchain_community.document_loaders import PyPDFLoader, TextLoader, UnstructuredMarkdownLoader
 
 
-def load_docs(path: str) -> List:
+def load_docs(path: str, ocr: bool = False, ocr_workers: Optional[int] = None) -> List:
     """
     Load documents from file path based on extension.
     
     Args:
         path: Path to the document file
+        ocr: OCR PDF pages that have no text layer
+        ocr_workers: Number of pages OCR'd at once (defaults to CPU count)
         
     Returns:
         List of loaded documents
@@ -27,7 +29,10 @@ def load_docs(path: str) -> List:
     if not file_path.exists():
         raise FileNotFoundError(f"File not found: {path}")
     
-    if path.endswith(".pdf"):
+    if path.endswith(".pdf") and ocr:
+        from app.ingestion.ocr import load_pdf_with_ocr
+        return load_pdf_with_ocr(path, workers=ocr_workers)
+    elif path.endswith(".pdf"):
         loader = PyPDFLoader(path)
     elif path.endswith(".md"):
         loader = UnstructuredMarkdownLoader(path)
@@ -62,4 +67,23 @@ def load_directory(directory: str, extensions: List[str] = [".pdf", ".md", ".txt
             except Exception as e:
                 print(f"Error loading {file_path}: {e}")
     
-    return all_docs
\ No newline at end of file
+    return all_docs
+
+
+def list_files(directory: str, extensions: List[str] = [".pdf", ".md", ".txt"]) -> List[str]:
+    """
+    List supported files in a directory in a stable order.
+    
+    Args:
+        directory: Path to directory
+        extensions: List of file extensions to include
+        
+    Returns:
+        Sorted list of file paths
+    """
+    dir_path = Path(directory)
+    return sorted(
+        str(file_path)
+        for ext in extensions
+        for file_path in dir_path.rglob(f"*{ext}")
+    )
\ No newline at end of file
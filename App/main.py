@@ -2,76 +2,112 @@
 FastAPI application entrypoint with LLM integration.
 """
 
-from fastapi import FastAPI
+import gc
+import time
+
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.core.config import get_settings
 from app.core.logging import setup_logging, get_logger
+from app.core.metrics import (
+    INDEX_SIZE, enable_tracing, format_server_timing, render_metrics, sample_process_memory,
+    start_request_timings
+)
 from app.api.routes import router
 from app.embeddings.embedder import get_embedder
 from app.vectorstore.faiss_store import load_store
 from app.rag.llm import get_llm, check_ollama_available
-from app.rag.chain import build_chain
 
 settings = get_settings()
 setup_logging(level="INFO" if not settings.debug else "DEBUG")
 logger = get_logger(__name__)
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
+def load_components(state):
     """
-    Lifecycle manager for FastAPI app.
-    Loads vector store and LLM on startup.
-    """
-    logger.info("Starting Mini-RAG API...")
+    Load embeddings model, vector store and LLM into app state.
     
+    Args:
+        state: FastAPI app state to populate
+    """
     # Load embeddings model
     try:
         logger.info(f"Loading embeddings model: {settings.embedding_model}")
-        embedder = get_embedder(settings.embedding_model)
-        app.state.embedder = embedder
+        embedder = get_embedder(
+            settings.embedding_model,
+            batch_size=settings.embedding_batch_size,
+            max_tokens_per_batch=settings.embedding_max_tokens_per_batch
+        )
+        state.embedder = embedder
     except Exception as e:
         logger.error(f"Failed to load embeddings: {e}")
-        app.state.embedder = None
+        state.embedder = None
     
     # Load vector store
     try:
         logger.info(f"Loading vector store from: {settings.vectorstore_path}")
-        store = load_store(settings.vectorstore_path, app.state.embedder)
-        app.state.vector_store = store
+        store = load_store(settings.vectorstore_path, state.embedder)
+        state.vector_store = store
         logger.info("Vector store loaded successfully")
     except Exception as e:
         logger.warning(f"Vector store not loaded: {e}")
         logger.warning("Run ingestion script first: python scripts/ingest.py <path>")
-        app.state.vector_store = None
+        state.vector_store = None
     
     # Load LLM
     if check_ollama_available():
         try:
             logger.info(f"Loading Ollama LLM: {settings.ollama_model}")
-            llm = get_llm()
-            app.state.llm = llm
-            
-            # Build RAG chain if vector store is available
-            if app.state.vector_store is not None:
-                logger.info("Building RAG chain...")
-                rag_chain = build_chain(llm, app.state.vector_store)
-                app.state.rag_chain = rag_chain
-                logger.info("RAG chain ready")
-            else:
-                app.state.rag_chain = None
-                logger.warning("RAG chain not built (vector store unavailable)")
+            state.llm = get_llm()
         except Exception as e:
             logger.error(f"Failed to initialize LLM: {e}")
-            app.state.llm = None
-            app.state.rag_chain = None
+            state.llm = None
     else:
         logger.warning("Ollama not available. Install with: curl -fsSL https://ollama.com/install.sh | sh")
         logger.warning(f"Then run: ollama pull {settings.ollama_model}")
-        app.state.llm = None
-        app.state.rag_chain = None
+        state.llm = None
+
+
+def preload_components(app: FastAPI):
+    """
+    Load components once in a pre-fork server's master process.
+    
+    Workers forked afterwards share the model weights and index pages
+    copy-on-write, and their lifespan skips loading. Objects are moved to
+    the GC's permanent generation so collections in workers don't write to
+    (and thereby copy) the shared pages.
+    
+    Args:
+        app: FastAPI application
+    """
+    logger.info("Preloading components before fork...")
+    load_components(app.state)
+    app.state.preloaded = True
+    gc.freeze()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Lifecycle manager for FastAPI app.
+    Loads vector store and LLM on startup, unless preloaded before fork.
+    """
+    logger.info("Starting Mini-RAG API...")
+    
+    if settings.enable_tracing and not enable_tracing():
+        logger.warning("Tracing requested but opentelemetry-api is not installed")
+    
+    if getattr(app.state, "preloaded", False):
+        logger.info("Using components preloaded by the master process")
+    else:
+        load_components(app.state)
+    
+    # Set per process: a pre-fork master's metric values are not inherited by workers
+    if app.state.vector_store is not None:
+        INDEX_SIZE.set(app.state.vector_store.index.ntotal)
+    sample_process_memory()
     
     logger.info("API ready to serve requests")
     
@@ -100,13 +136,33 @@ app.add_middleware(
 app.include_router(router, prefix="/api/v1")
 
 
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    """Attach per-stage timings to every response as a Server-Timing header."""
+    timings = start_request_timings()
+    start = time.perf_counter()
+    response = await call_next(request)
+    timings["total"] = time.perf_counter() - start
+    response.headers["Server-Timing"] = format_server_timing(timings)
+    sample_process_memory()
+    return response
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint."""
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
     return {
         "message": "Mini-RAG API",
         "docs": "/docs",
-        "health": "/api/v1/health"
+        "health": "/api/v1/health",
+        "metrics": "/metrics"
     }
 
 
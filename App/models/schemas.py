@@ -2,11 +2,33 @@
 Pydantic models for API request/response validation.
 """
 
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, model_validator
 
 
-class QueryRequest(BaseModel):
+class RetrievalOptions(BaseModel):
+    """Retrieval tuning shared by query and ask requests."""
+    mmr: bool = Field(False, description="Diversify results with maximal marginal relevance")
+    fetch_k: int = Field(20, description="Number of candidates MMR chooses from", ge=1, le=200)
+    lambda_mult: float = Field(
+        0.5, description="MMR trade-off: 1 = relevance only, 0 = diversity only", ge=0, le=1
+    )
+    min_similarity: Optional[float] = Field(
+        None, description="Drop contexts below this cosine similarity", ge=-1, le=1
+    )
+    max_relative_drop: Optional[float] = Field(
+        None,
+        description="Stop at the first similarity drop larger than this fraction of the previous hit",
+        gt=0,
+        lt=1
+    )
+    
+    def retrieval_kwargs(self) -> dict:
+        """Keyword arguments for retrieve_with_scores."""
+        return self.model_dump(include=set(RetrievalOptions.model_fields))
+
+
+class QueryRequest(RetrievalOptions):
     """Request model for querying the vector store."""
     query: str = Field(..., description="Query string", min_length=1)
     k: int = Field(4, description="Number of documents to retrieve", ge=1, le=20)
@@ -26,10 +48,32 @@ class QueryResponse(BaseModel):
     count: int
 
 
-class AskRequest(BaseModel):
+class AskRequest(RetrievalOptions):
     """Request model for RAG question answering."""
     question: str = Field(..., description="Question to answer", min_length=1)
-    k: int = Field(4, description="Number of context documents", ge=1, le=20)
+    k: int = Field(
+        4,
+        description="Number of context documents (up to 20, or 50 in map_reduce mode)",
+        ge=1,
+        le=50
+    )
+    mode: Literal["stuff", "map_reduce"] = Field(
+        "stuff",
+        description="'stuff' puts all contexts in one prompt; 'map_reduce' extracts "
+                    "evidence per context concurrently, then answers from it"
+    )
+    min_evidence: Optional[int] = Field(
+        None,
+        description="map_reduce only: stop once this many contexts yielded evidence",
+        ge=1
+    )
+    
+    @model_validator(mode="after")
+    def check_k_for_mode(self):
+        """Only map_reduce may retrieve more than 20 contexts."""
+        if self.mode == "stuff" and self.k > 20:
+            raise ValueError("k must be at most 20 in 'stuff' mode; use 'map_reduce' for up to 50")
+        return self
 
 
 class AskResponse(BaseModel):
@@ -2,9 +2,19 @@
 RAG chain assembly module.
 """
 
+import asyncio
+import time
+from typing import List, Optional
+
 from langchain.chains import RetrievalQA
 from langchain.prompts import PromptTemplate
 
+from app.core.logging import get_logger
+from app.core.metrics import record_stage, timed
+
+
+logger = get_logger(__name__)
+
 
 # Custom prompt template for RAG
 RAG_PROMPT_TEMPLATE = """You are a helpful assistant answering questions based on the provided context.
@@ -19,6 +29,30 @@ Question: {question}
 Answer:"""
 
 
+# Map step: pull evidence for the question out of a single chunk
+MAP_PROMPT_TEMPLATE = """Extract the parts of the following text that help answer the question. Quote or closely paraphrase them. If nothing in the text is relevant, reply with exactly NONE.
+
+Text:
+{context}
+
+Question: {question}
+
+Relevant information:"""
+
+
+# Reduce step: answer from the evidence extracted by the map step
+REDUCE_PROMPT_TEMPLATE = """You are a helpful assistant answering questions based on the provided notes.
+
+The notes below were extracted from several documents. Use them to answer the question at the end. If you don't know the answer based on the notes, just say that you don't know, don't try to make up an answer.
+
+Notes:
+{context}
+
+Question: {question}
+
+Answer:"""
+
+
 def build_chain(llm, store, chain_type: str = "stuff"):
     """
     Build RAG chain from LLM and vector store.
@@ -68,4 +102,130 @@ def build_custom_chain(llm, retriever):
     
     qa_chain = load_qa_chain(llm, chain_type="stuff", prompt=prompt)
     
-    return qa_chain
\ No newline at end of file
+    return qa_chain
+
+
+def build_prompt(question: str, docs: List) -> str:
+    """
+    Fill the RAG prompt with already retrieved documents.
+    
+    Args:
+        question: User question
+        docs: Retrieved documents
+        
+    Returns:
+        Prompt string, equivalent to what the "stuff" chain sends
+    """
+    with timed("prompt_build"):
+        context = "\n\n".join(doc.page_content for doc in docs)
+        return RAG_PROMPT_TEMPLATE.format(context=context, question=question)
+
+
+async def generate_answer(llm, question: str, docs: List) -> str:
+    """
+    Answer a question from retrieved documents, recording LLM timings.
+    
+    Streams the completion asynchronously, so the event loop keeps serving
+    other requests and time-to-first-token is measured separately from total
+    generation time.
+    
+    Args:
+        llm: Language model instance
+        question: User question
+        docs: Retrieved documents
+        
+    Returns:
+        Generated answer
+    """
+    prompt = build_prompt(question, docs)
+    
+    parts = []
+    with timed("llm_generation"):
+        start = time.perf_counter()
+        async for chunk in llm.astream(prompt):
+            if not parts:
+                record_stage("llm_ttft", time.perf_counter() - start)
+            parts.append(chunk)
+    
+    return "".join(parts)
+
+
+async def _map_chunk(llm, question: str, doc, semaphore: asyncio.Semaphore) -> Optional[str]:
+    """Run the map prompt over one chunk; None if it holds no evidence or the call failed."""
+    async with semaphore:
+        prompt = MAP_PROMPT_TEMPLATE.format(context=doc.page_content, question=question)
+        try:
+            evidence = (await llm.ainvoke(prompt)).strip()
+        except Exception as e:
+            # One failed chunk should not fail the whole answer
+            logger.warning(f"Map call failed, treating chunk as no evidence: {e}")
+            return None
+    
+    if not evidence or evidence.upper().startswith("NONE"):
+        return None
+    return evidence
+
+
+async def generate_answer_map_reduce(
+    llm,
+    question: str,
+    docs: List,
+    max_concurrency: int = 4,
+    min_evidence: Optional[int] = None
+) -> str:
+    """
+    Answer a question with a concurrent map step and a single reduce step.
+    
+    Each chunk gets its own extraction prompt; at most `max_concurrency` run
+    against the LLM at once. A map call that fails counts as no evidence.
+    Once `min_evidence` chunks have yielded evidence, the remaining map tasks
+    are cancelled: calls that have not started are skipped, and in-flight
+    calls are aborted (the Ollama client streams over aiohttp, so cancelling
+    closes the request). The evidence is then combined, in retrieval order,
+    into one reduce prompt.
+    
+    Args:
+        llm: Language model instance
+        question: User question
+        docs: Retrieved documents, best first
+        max_concurrency: Maximum number of concurrent map calls
+        min_evidence: Stop the map step after this many relevant chunks (None = map all)
+        
+    Returns:
+        Generated answer
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    evidence = {}
+    
+    with timed("llm_map"):
+        tasks = {
+            asyncio.create_task(_map_chunk(llm, question, doc, semaphore)): rank
+            for rank, doc in enumerate(docs)
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    if result is not None:
+                        evidence[tasks[task]] = result
+                if min_evidence is not None and len(evidence) >= min_evidence:
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    with timed("prompt_build"):
+        notes = "\n\n".join(evidence[rank] for rank in sorted(evidence))
+        prompt = REDUCE_PROMPT_TEMPLATE.format(context=notes, question=question)
+    
+    parts = []
+    with timed("llm_generation"):
+        start = time.perf_counter()
+        async for chunk in llm.astream(prompt):
+            if not parts:
+                record_stage("llm_ttft", time.perf_counter() - start)
+            parts.append(chunk)
+    
+    return "".join(parts)
\ No newline at end of file
@@ -2,9 +2,13 @@
 Retrieval module for querying the vector store.
 """
 
-from typing import List
+from typing import List, Optional
+
+import numpy as np
 from langchain_community.vectorstores import FAISS
 
+from app.core.metrics import timed
+
 
 def load_store(store_path: str, embedder):
     """
@@ -40,19 +44,144 @@ def retrieve(query: str, store, k: int = 4) -> List:
     return docs
 
 
-def retrieve_with_scores(query: str, store, k: int = 4):
+def mmr_select(
+    query_vector: np.ndarray,
+    candidates: np.ndarray,
+    k: int,
+    lambda_mult: float = 0.5
+) -> List[int]:
+    """
+    Pick k candidates by maximal marginal relevance.
+    
+    All similarities are computed up front as matrix products; each step
+    only updates a running max-similarity vector, so there is no Python loop
+    over candidates.
+    
+    Args:
+        query_vector: Query embedding, shape (dim,)
+        candidates: Candidate embeddings, shape (n, dim)
+        k: Number of candidates to select
+        lambda_mult: 1 = relevance only, 0 = diversity only
+        
+    Returns:
+        Indices into `candidates`, in selection order
+    """
+    if len(candidates) == 0 or k < 1:
+        return []
+    
+    candidates = candidates / np.maximum(np.linalg.norm(candidates, axis=1, keepdims=True), 1e-12)
+    query_vector = query_vector / max(np.linalg.norm(query_vector), 1e-12)
+    
+    relevance = candidates @ query_vector
+    similarity = candidates @ candidates.T
+    
+    selected = [int(np.argmax(relevance))]
+    max_similarity = similarity[selected[0]].copy()
+    
+    for _ in range(min(k, len(candidates)) - 1):
+        scores = lambda_mult * relevance - (1 - lambda_mult) * max_similarity
+        scores[selected] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        np.maximum(max_similarity, similarity[best], out=max_similarity)
+    
+    return selected
+
+
+def adaptive_cutoff(
+    scores: List[float],
+    min_similarity: Optional[float] = None,
+    max_relative_drop: Optional[float] = None
+) -> int:
+    """
+    Number of leading hits to keep before relevance falls off.
+    
+    Scores are FAISS squared L2 distances over normalized embeddings, so
+    cosine similarity is 1 - score / 2. The best hit is always kept.
+    
+    Args:
+        scores: Distances, best first
+        min_similarity: Stop at the first hit below this cosine similarity
+        max_relative_drop: Stop when similarity falls by more than this fraction
+            from the previous hit
+        
+    Returns:
+        Number of hits to keep
+    """
+    similarities = 1 - np.asarray(scores, dtype=np.float32) / 2
+    keep = np.ones(len(similarities), dtype=bool)
+    
+    if min_similarity is not None:
+        keep &= similarities >= min_similarity
+    if max_relative_drop is not None and len(similarities) > 1:
+        previous = np.maximum(similarities[:-1], 1e-12)
+        keep[1:] &= (previous - similarities[1:]) / previous <= max_relative_drop
+    
+    cut = int(np.argmin(keep)) if not keep.all() else len(keep)
+    return max(1, cut)
+
+
+def _search_with_vectors(store, embedding: List[float], fetch_k: int):
+    """Search the index and return hits with their stored vectors in one call."""
+    query = np.asarray([embedding], dtype=np.float32)
+    distances, ids, vectors = store.index.search_and_reconstruct(query, fetch_k)
+    
+    hits = [(i, idx) for i, idx in enumerate(ids[0]) if idx != -1]
+    docs_with_scores = [
+        (store.docstore.search(store.index_to_docstore_id[idx]), float(distances[0][i]))
+        for i, idx in hits
+    ]
+    return docs_with_scores, vectors[0][[i for i, _ in hits]]
+
+
+def retrieve_with_scores(
+    query: str,
+    store,
+    k: int = 4,
+    mmr: bool = False,
+    fetch_k: int = 20,
+    lambda_mult: float = 0.5,
+    min_similarity: Optional[float] = None,
+    max_relative_drop: Optional[float] = None
+):
     """
     Retrieve documents with similarity scores.
     
     Args:
         query: Query string
         store: FAISS vector store
-        k: Number of documents to retrieve
+        k: Number of documents to retrieve (an upper bound with adaptive cutoffs)
+        mmr: Diversify results with maximal marginal relevance
+        fetch_k: Number of candidates MMR chooses from
+        lambda_mult: MMR trade-off (1 = relevance only, 0 = diversity only)
+        min_similarity: Drop hits below this cosine similarity
+        max_relative_drop: Stop at the first relative similarity drop larger than this
         
     Returns:
         List of tuples (document, score)
     """
-    docs_with_scores = store.similarity_search_with_score(query, k=k)
+    with timed("embedding"):
+        embedding = store.embedding_function.embed_query(query)
+    
+    with timed("vector_search"):
+        if mmr:
+            docs_with_scores, vectors = _search_with_vectors(store, embedding, max(fetch_k, k))
+        else:
+            docs_with_scores = store.similarity_search_with_score_by_vector(embedding, k=k)
+    
+    if min_similarity is not None or max_relative_drop is not None:
+        cut = adaptive_cutoff(
+            [score for _, score in docs_with_scores], min_similarity, max_relative_drop
+        )
+        docs_with_scores = docs_with_scores[:cut]
+        if mmr:
+            vectors = vectors[:cut]
+    
+    if mmr and docs_with_scores:
+        with timed("rerank"):
+            selected = mmr_select(np.asarray(embedding, dtype=np.float32), vectors, k, lambda_mult)
+            docs_with_scores = [docs_with_scores[i] for i in selected]
+    
     return docs_with_scores
 
 
@@ -0,0 +1,196 @@
+"""
+CLI script for measuring memory per worker and throughput across worker counts.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+import httpx
+
+from app.core.config import get_settings
+from scripts.benchmark import WORDS, bench_endpoint
+
+
+def memory_mb(pid: int) -> dict:
+    """
+    Memory of a process from /proc/<pid>/smaps_rollup.
+
+    Pss splits shared pages evenly between the processes sharing them, so
+    summing Pss over master and workers gives the real total.
+
+    Returns:
+        Dict with rss_mb, pss_mb and private_mb
+    """
+    fields = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        name, value = line.split(":", 1)
+        fields[name] = int(value.split()[0])
+
+    return {
+        "rss_mb": round(fields["Rss"] / 1024, 1),
+        "pss_mb": round(fields["Pss"] / 1024, 1),
+        "private_mb": round((fields["Private_Clean"] + fields["Private_Dirty"]) / 1024, 1),
+    }
+
+
+def describe_setup() -> dict:
+    """
+    Model, index size and machine a run was measured on.
+
+    Memory per worker is dominated by the model and index, so results are
+    only comparable between runs with the same setup.
+    """
+    import faiss
+
+    settings = get_settings()
+    index_path = Path(settings.vectorstore_path) / "index.faiss"
+    meminfo = dict(
+        line.split(":", 1) for line in Path("/proc/meminfo").read_text().splitlines()
+    )
+
+    return {
+        "embedding_model": settings.embedding_model,
+        "llm": settings.ollama_model,
+        "index_vectors": faiss.read_index(str(index_path)).ntotal if index_path.exists() else 0,
+        "index_mb": round(index_path.stat().st_size / 1024 ** 2, 1) if index_path.exists() else 0,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "memory_mb": round(int(meminfo["MemTotal"].split()[0]) / 1024),
+        "python": platform.python_version(),
+    }
+
+
+def child_pids(pid: int):
+    """Direct children of a process."""
+    pids = []
+    for task in Path(f"/proc/{pid}/task").iterdir():
+        pids += [int(child) for child in (task / "children").read_text().split()]
+    return pids
+
+
+def wait_ready(base_url: str, workers: int, master_pid: int, timeout: float = 300):
+    """Wait until the server answers and all workers have started."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base_url}/api/v1/health").status_code == 200:
+                if len(child_pids(master_pid)) >= workers:
+                    return
+        except httpx.TransportError:
+            pass
+        time.sleep(1)
+    raise TimeoutError(f"Server at {base_url} did not become ready")
+
+
+async def bench_throughput(base_url: str, queries, k: int, concurrency: int) -> dict:
+    """Measure /query latency and throughput against a running server."""
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        # Warm up every worker before measuring
+        await bench_endpoint(client, "/api/v1/query", [{"query": q, "k": k} for q in queries[:50]],
+                             concurrency)
+        return await bench_endpoint(
+            client, "/api/v1/query", [{"query": q, "k": k} for q in queries], concurrency
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memory and throughput per worker count")
+    parser.add_argument(
+        "--workers",
+        default="1,2,4,8",
+        help="Comma-separated worker counts"
+    )
+    parser.add_argument(
+        "--queries",
+        type=int,
+        default=500,
+        help="Number of /query requests per worker count"
+    )
+    parser.add_argument(
+        "--concurrency-per-worker",
+        type=int,
+        default=4,
+        help="In-flight requests per worker"
+    )
+    parser.add_argument(
+        "-k",
+        type=int,
+        default=4,
+        help="Number of documents to retrieve per query"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8100,
+        help="Port to run the server on"
+    )
+    parser.add_argument(
+        "--output",
+        default="bench_workers.json",
+        help="Path to write JSON results"
+    )
+
+    args = parser.parse_args()
+    base_url = f"http://127.0.0.1:{args.port}"
+    rng = random.Random(0)
+    queries = [" ".join(rng.choices(WORDS, k=8)) for _ in range(args.queries)]
+    root = Path(__file__).parent.parent
+    setup = describe_setup()
+    print(json.dumps(setup, indent=2))
+
+    runs = []
+    for workers in [int(w) for w in args.workers.split(",")]:
+        print(f"\nStarting gunicorn with {workers} workers...")
+        env = {**os.environ, "WEB_CONCURRENCY": str(workers), "API_HOST": "127.0.0.1",
+               "API_PORT": str(args.port)}
+        server = subprocess.Popen(
+            ["gunicorn", "-c", str(root / "app" / "gunicorn_conf.py"), "app.main:app"],
+            cwd=str(root),
+            env=env
+        )
+        try:
+            wait_ready(base_url, workers, server.pid)
+            throughput = asyncio.run(bench_throughput(
+                base_url, queries, args.k, workers * args.concurrency_per_worker
+            ))
+            worker_memory = [memory_mb(pid) for pid in child_pids(server.pid)]
+            run = {
+                "workers": workers,
+                "master": memory_mb(server.pid),
+                "per_worker_pss_mb": round(
+                    sum(m["pss_mb"] for m in worker_memory) / len(worker_memory), 1
+                ),
+                "per_worker_private_mb": round(
+                    sum(m["private_mb"] for m in worker_memory) / len(worker_memory), 1
+                ),
+                "total_pss_mb": round(
+                    memory_mb(server.pid)["pss_mb"] + sum(m["pss_mb"] for m in worker_memory), 1
+                ),
+                "throughput": throughput,
+            }
+            runs.append(run)
+            print(json.dumps(run, indent=2))
+        finally:
+            server.terminate()
+            server.wait()
+
+    Path(args.output).write_text(json.dumps(
+        {"config": vars(args), "setup": setup, "runs": runs}, indent=2
+    ))
+    print(f"\nWrote results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
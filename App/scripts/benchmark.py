@@ -0,0 +1,342 @@
+"""
+CLI script for benchmarking the ingestion and query paths offline.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from langchain_core.documents import Document
+from langchain_community.embeddings import DeterministicFakeEmbedding
+from langchain_community.llms.fake import FakeListLLM
+from langchain_community.vectorstores import FAISS
+
+from app.ingestion.chunker import chunk_docs
+from app.embeddings.embedder import get_embedder
+
+
+WORDS = (
+    "retrieval augmented generation vector index embedding chunk document query answer "
+    "context model latency throughput memory batch token page section report policy data "
+    "system local private search score rank prompt llm server worker cache store"
+).split()
+
+
+def reset_peak_memory():
+    """Reset the peak RSS counter (VmHWM) so the next reading covers only what follows."""
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+    except OSError:
+        pass
+
+
+def peak_memory_mb() -> float:
+    """
+    Peak resident memory in MB since the last `reset_peak_memory`.
+
+    Falls back to the lifetime peak where /proc is unavailable.
+    """
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def generate_corpus(num_chunks: int, chunk_size: int = 800, seed: int = 0):
+    """
+    Generate synthetic documents that split into roughly `num_chunks` chunks.
+
+    Args:
+        num_chunks: Target number of chunks
+        chunk_size: Chunk size the corpus will be split with
+        seed: Random seed, so runs are comparable
+
+    Returns:
+        List of documents
+    """
+    rng = random.Random(seed)
+    chunks_per_doc = 10
+    words_per_chunk = chunk_size // 7
+    docs = []
+
+    for doc_id in range((num_chunks + chunks_per_doc - 1) // chunks_per_doc):
+        paragraphs = [
+            " ".join(rng.choices(WORDS, k=words_per_chunk))
+            for _ in range(chunks_per_doc)
+        ]
+        docs.append(Document(
+            page_content="\n\n".join(paragraphs),
+            metadata={"source": f"synthetic-{doc_id}.txt", "page": 0}
+        ))
+
+    return docs
+
+
+def timed_stage(results: dict, name: str, items: int, fn, *args, **kwargs):
+    """Run one ingestion stage and record its duration, throughput and peak memory."""
+    reset_peak_memory()
+    start = time.perf_counter()
+    value = fn(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    results[name] = {
+        "seconds": round(elapsed, 4),
+        "items_per_sec": round(items / elapsed, 1) if elapsed else None,
+        "peak_memory_mb": round(peak_memory_mb(), 1),
+    }
+    return value
+
+
+def bench_ingestion(num_chunks: int, embedder, chunk_size: int, chunk_overlap: int, seed: int):
+    """
+    Benchmark corpus chunking, embedding and index build.
+
+    Returns:
+        Tuple of (stage results, built store)
+    """
+    results = {}
+    docs = generate_corpus(num_chunks, chunk_size=chunk_size, seed=seed)
+
+    chunks = timed_stage(
+        results, "chunk_docs", len(docs),
+        chunk_docs, docs, chunk_size=chunk_size, chunk_overlap=chunk_overlap
+    )
+    texts = [chunk.page_content for chunk in chunks]
+    embeddings = timed_stage(
+        results, "embed_documents", len(texts), embedder.embed_documents, texts
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = timed_stage(
+            results, "build_store", len(chunks),
+            build_index, chunks, embeddings, embedder, str(Path(tmp) / "vectorstore")
+        )
+
+    results["chunks"] = len(chunks)
+    return results, store
+
+
+def build_index(chunks, embeddings, embedder, store_path: str):
+    """Build and save a FAISS store from vectors computed in the embedding stage."""
+    store = FAISS.from_embeddings(
+        zip([chunk.page_content for chunk in chunks], embeddings),
+        embedder,
+        metadatas=[chunk.metadata for chunk in chunks]
+    )
+    store.save_local(store_path)
+    return store
+
+
+def bench_retrieval(store, queries, k: int):
+    """Benchmark `retrieve_with_scores` directly, without the HTTP layer."""
+    from app.rag.retriever import retrieve_with_scores
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        retrieve_with_scores(query, store, k=k)
+        latencies.append(time.perf_counter() - start)
+
+    return summarize(latencies)
+
+
+def summarize(latencies) -> dict:
+    """Summarize latencies in milliseconds."""
+    return {
+        "requests": len(latencies),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+async def bench_endpoint(client, endpoint: str, payloads, concurrency: int) -> dict:
+    """Fire payloads at an endpoint with bounded concurrency and collect latencies."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(payload):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post(endpoint, json=payload)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(payload) for payload in payloads))
+    elapsed = time.perf_counter() - start
+
+    result = summarize(latencies)
+    result["errors"] = errors
+    result["requests_per_sec"] = round(len(payloads) / elapsed, 1)
+    return result
+
+
+async def bench_api(store, queries, k: int, concurrency_levels):
+    """
+    Benchmark /query and /ask against the in-process FastAPI app.
+
+    The app state is populated directly (lifespan is not run) and a stub LLM
+    stands in for Ollama so the numbers cover our own overhead only.
+    """
+    import httpx
+    from app.main import app
+
+    app.state.vector_store = store
+    app.state.llm = FakeListLLM(responses=["This is a stub answer."])
+
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for concurrency in concurrency_levels:
+            results[f"query@{concurrency}"] = await bench_endpoint(
+                client, "/api/v1/query",
+                [{"query": q, "k": k} for q in queries], concurrency
+            )
+            results[f"ask@{concurrency}"] = await bench_endpoint(
+                client, "/api/v1/ask",
+                [{"question": q, "k": k} for q in queries], concurrency
+            )
+
+    return results
+
+
+def run_size(size: int, args: argparse.Namespace, queries) -> dict:
+    """
+    Benchmark one corpus size.
+
+    Runs in its own process, so memory of previous sizes does not carry over.
+    """
+    if args.embedding_model:
+        embedder = get_embedder(args.embedding_model)
+    else:
+        embedder = DeterministicFakeEmbedding(size=384)
+    concurrency_levels = [int(level) for level in args.concurrency.split(",")]
+
+    ingestion, store = bench_ingestion(
+        size, embedder, args.chunk_size, args.chunk_overlap, args.seed
+    )
+
+    reset_peak_memory()
+    retrieval = bench_retrieval(store, queries, args.k)
+    retrieval["peak_memory_mb"] = round(peak_memory_mb(), 1)
+
+    reset_peak_memory()
+    api = asyncio.run(bench_api(store, queries, args.k, concurrency_levels))
+    api["peak_memory_mb"] = round(peak_memory_mb(), 1)
+
+    peaks = [stage["peak_memory_mb"] for stage in ingestion.values() if isinstance(stage, dict)]
+    return {
+        "size": size,
+        "ingestion": ingestion,
+        "retrieval": retrieval,
+        "api": api,
+        "peak_memory_mb": max(peaks + [retrieval["peak_memory_mb"], api["peak_memory_mb"]]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ingestion and query paths")
+    parser.add_argument(
+        "--sizes",
+        default="10000",
+        help="Comma-separated corpus sizes in chunks (e.g. 10000,100000,1000000)"
+    )
+    parser.add_argument(
+        "--queries",
+        type=int,
+        default=200,
+        help="Number of queries per concurrency level"
+    )
+    parser.add_argument(
+        "--concurrency",
+        default="1,4,16",
+        help="Comma-separated concurrency levels for the API benchmark"
+    )
+    parser.add_argument(
+        "-k",
+        type=int,
+        default=4,
+        help="Number of documents to retrieve per query"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=800,
+        help="Chunk size in characters"
+    )
+    parser.add_argument(
+        "--chunk-overlap",
+        type=int,
+        default=150,
+        help="Chunk overlap in characters"
+    )
+    parser.add_argument(
+        "--embedding-model",
+        default=None,
+        help="HuggingFace embedding model (default: deterministic fake embeddings, fully offline)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Random seed for the synthetic corpus and queries"
+    )
+    parser.add_argument(
+        "--output",
+        default="benchmark.json",
+        help="Path to write JSON results"
+    )
+
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    rng = random.Random(args.seed)
+    queries = [" ".join(rng.choices(WORDS, k=8)) for _ in range(args.queries)]
+
+    report = {
+        "config": vars(args),
+        "platform": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+        },
+        "runs": [],
+    }
+
+    for size in sizes:
+        print(f"\nBenchmarking corpus of {size} chunks...")
+        with mp.get_context("spawn").Pool(1) as pool:
+            report["runs"].append(pool.apply(run_size, (size, args, queries)))
+        print(json.dumps(report["runs"][-1], indent=2))
+
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"\nWrote results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
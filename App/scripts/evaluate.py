@@ -0,0 +1,233 @@
+"""
+CLI script for evaluating retrieval quality against speed across index and chunking parameters.
+"""
+
+import argparse
+import itertools
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+import faiss
+
+from app.ingestion.loader import load_docs, load_directory
+from app.ingestion.chunker import chunk_docs
+from app.embeddings.embedder import get_embedder
+from app.vectorstore.faiss_store import INDEX_TYPES, build_store_from_embeddings
+from app.rag.retriever import retrieve_with_scores
+from scripts.benchmark import percentile
+
+
+def load_query_set(path: str):
+    """
+    Load a labelled query set.
+
+    Each line is a JSON object: {"query": "...", "sources": ["file.pdf", ...]}.
+
+    Args:
+        path: Path to the JSONL file
+
+    Returns:
+        List of (query, expected sources) tuples
+    """
+    queries = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                item = json.loads(line)
+                queries.append((item["query"], item["sources"]))
+    return queries
+
+
+def is_relevant(doc, expected) -> bool:
+    """A retrieved chunk is relevant if its source matches one of the expected sources."""
+    source = str(doc.metadata.get("source", ""))
+    return any(source == exp or source.endswith("/" + exp) for exp in expected)
+
+
+def doc_key(doc):
+    """Identity of a chunk, used to compare ANN results with exact search."""
+    return (doc.metadata.get("source"), doc.metadata.get("page"), doc.page_content)
+
+
+def evaluate_store(store, queries, k: int, exact_results=None, is_exact: bool = False):
+    """
+    Run every query against a store and compute quality and latency metrics.
+
+    Args:
+        store: FAISS vector store
+        queries: List of (query, expected sources)
+        k: Number of documents to retrieve
+        exact_results: Per-query results of exact search, to score ANN recall against
+            (exact_recall is None without them, unless the store is itself exact)
+
+    Returns:
+        Tuple of (metrics dict, per-query result lists)
+    """
+    latencies = []
+    recalls = []
+    reciprocal_ranks = []
+    ann_recalls = []
+    all_results = []
+
+    for i, (query, expected) in enumerate(queries):
+        start = time.perf_counter()
+        docs_with_scores = retrieve_with_scores(query, store, k=k)
+        latencies.append(time.perf_counter() - start)
+
+        docs = [doc for doc, _ in docs_with_scores]
+        all_results.append(docs)
+
+        found = {exp for exp in expected for doc in docs if is_relevant(doc, [exp])}
+        recalls.append(len(found) / len(expected) if expected else 0.0)
+
+        rank = next((r for r, doc in enumerate(docs, 1) if is_relevant(doc, expected)), None)
+        reciprocal_ranks.append(1.0 / rank if rank else 0.0)
+
+        if exact_results is not None:
+            exact_keys = {doc_key(doc) for doc in exact_results[i]}
+            hits = sum(1 for doc in docs if doc_key(doc) in exact_keys)
+            ann_recalls.append(hits / len(exact_keys) if exact_keys else 1.0)
+
+    metrics = {
+        f"recall@{k}": round(sum(recalls) / len(recalls), 4),
+        "mrr": round(sum(reciprocal_ranks) / len(reciprocal_ranks), 4),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "exact_recall": None,
+    }
+    if is_exact:
+        metrics["exact_recall"] = 1.0
+    elif exact_results is not None:
+        metrics["exact_recall"] = round(sum(ann_recalls) / len(ann_recalls), 4)
+    return metrics, all_results
+
+
+def parse_list(value: str, cast=int):
+    """Parse a comma-separated CLI value."""
+    return [cast(item) for item in value.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate retrieval quality vs. speed")
+    parser.add_argument(
+        "path",
+        help="Path to document or directory"
+    )
+    parser.add_argument(
+        "queries",
+        help="Labelled query set (JSONL with 'query' and 'sources')"
+    )
+    parser.add_argument(
+        "--chunk-sizes",
+        default="400,800,1200",
+        help="Comma-separated chunk sizes to sweep"
+    )
+    parser.add_argument(
+        "--chunk-overlaps",
+        default="0,150",
+        help="Comma-separated chunk overlaps to sweep"
+    )
+    parser.add_argument(
+        "--k",
+        default="2,4,8",
+        help="Comma-separated k values to sweep"
+    )
+    parser.add_argument(
+        "--index-types",
+        default=",".join(INDEX_TYPES),
+        help=f"Comma-separated index types to sweep ({', '.join(INDEX_TYPES)})"
+    )
+    parser.add_argument(
+        "--embedding-model",
+        default="sentence-transformers/all-MiniLM-L6-v2",
+        help="HuggingFace embedding model name"
+    )
+    parser.add_argument(
+        "--target-recall",
+        type=float,
+        default=None,
+        help="Report the fastest configuration reaching this recall@k"
+    )
+    parser.add_argument(
+        "--output",
+        default="evaluation.json",
+        help="Path to write JSON results"
+    )
+
+    args = parser.parse_args()
+    index_types = parse_list(args.index_types, str)
+
+    path = Path(args.path)
+    docs = load_directory(str(path)) if path.is_dir() else load_docs(str(path))
+    queries = load_query_set(args.queries)
+    embedder = get_embedder(args.embedding_model)
+
+    print(f"Evaluating {len(queries)} queries over {len(docs)} documents")
+
+    results = []
+    for chunk_size, chunk_overlap in itertools.product(
+        parse_list(args.chunk_sizes), parse_list(args.chunk_overlaps)
+    ):
+        if chunk_overlap >= chunk_size:
+            continue
+
+        chunks = chunk_docs(docs, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        start = time.perf_counter()
+        embeddings = embedder.embed_documents([chunk.page_content for chunk in chunks])
+        embed_seconds = time.perf_counter() - start
+
+        # Exact search goes first so ANN variants can be scored against it
+        ordered_types = sorted(index_types, key=lambda t: t != "flat")
+        exact = {}
+
+        for index_type in ordered_types:
+            start = time.perf_counter()
+            store = build_store_from_embeddings(chunks, embeddings, embedder, index_type)
+            build_seconds = time.perf_counter() - start
+            index_bytes = faiss.serialize_index(store.index).nbytes
+
+            for k in parse_list(args.k):
+                metrics, per_query = evaluate_store(
+                    store, queries, k, exact.get(k), is_exact=index_type == "flat"
+                )
+                if index_type == "flat":
+                    exact[k] = per_query
+
+                row = {
+                    "chunk_size": chunk_size,
+                    "chunk_overlap": chunk_overlap,
+                    "index_type": index_type,
+                    "k": k,
+                    "chunks": len(chunks),
+                    "embed_seconds": round(embed_seconds, 3),
+                    "build_seconds": round(build_seconds, 3),
+                    "index_mb": round(index_bytes / 1024 ** 2, 2),
+                    **metrics,
+                }
+                results.append(row)
+                print(
+                    f"size={chunk_size:<5} overlap={chunk_overlap:<4} index={index_type:<5} "
+                    f"k={k:<3} recall={metrics[f'recall@{k}']:.3f} mrr={metrics['mrr']:.3f} "
+                    f"exact_recall={metrics['exact_recall']} p50={metrics['p50_ms']}ms "
+                    f"build={build_seconds:.2f}s index={row['index_mb']}MB"
+                )
+
+    report = {"config": vars(args), "results": results}
+
+    if args.target_recall is not None:
+        passing = [r for r in results if r[f"recall@{r['k']}"] >= args.target_recall]
+        best = min(passing, key=lambda r: r["p95_ms"]) if passing else None
+        report["best"] = best
+        print(f"\nFastest configuration with recall >= {args.target_recall}: {best}")
+
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"\nWrote results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,16 +3,17 @@ CLI script for ingesting documents into the vector store.
 """
 
 import argparse
+import os
 import sys
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
-from app.ingestion.loader import load_docs, load_directory
-from app.ingestion.chunker import chunk_docs
+from app.ingestion.loader import list_files
+from app.ingestion.bulk import ingest_files
 from app.embeddings.embedder import get_embedder
-from app.vectorstore.faiss_store import build_store
+from app.embeddings.parallel import ParallelEmbedder
 
 
 def main():
@@ -43,38 +44,122 @@ def main():
         default="sentence-transformers/all-MiniLM-L6-v2",
         help="HuggingFace embedding model name"
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=256,
+        help="Number of chunks embedded per batch, per embedding worker"
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=10,
+        help="Save index and manifest every N batches"
+    )
+    parser.add_argument(
+        "--embed-batch-size",
+        type=int,
+        default=32,
+        help="Chunks per model forward pass (length-bucketed)"
+    )
+    parser.add_argument(
+        "--max-tokens-per-batch",
+        type=int,
+        default=None,
+        help="Padded-token budget per model forward pass"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of embedding worker processes (1 = embed in this process)"
+    )
+    parser.add_argument(
+        "--threads-per-worker",
+        type=int,
+        default=None,
+        help="Intra-op threads per embedding worker (default: cores / workers)"
+    )
+    parser.add_argument(
+        "--ocr",
+        action="store_true",
+        help="OCR PDF pages that have no text layer (results are cached)"
+    )
+    parser.add_argument(
+        "--ocr-workers",
+        type=int,
+        default=None,
+        help="Number of PDF pages OCR'd in parallel (default: CPU count)"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume from the last checkpoint at --store-path"
+    )
     
     args = parser.parse_args()
     
+    if args.ocr:
+        # Pages are OCR'd in parallel, so each tesseract process should use one core
+        os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+    
     print("=" * 60)
     print("Starting document ingestion...")
     print("=" * 60)
     
-    # Load documents
-    print(f"\n[1/4] Loading documents from: {args.path}")
+    # Find documents
+    print(f"\n[1/3] Finding documents in: {args.path}")
     path = Path(args.path)
-    if path.is_dir():
-        docs = load_directory(str(path))
-    else:
-        docs = load_docs(str(path))
+    files = list_files(str(path)) if path.is_dir() else [str(path)]
     
-    if not docs:
-        print("No documents loaded. Exiting.")
+    if not files:
+        print("No documents found. Exiting.")
         return
     
-    print(f"Loaded {len(docs)} documents")
-    
-    # Chunk documents
-    print(f"\n[2/4] Chunking documents (size={args.chunk_size}, overlap={args.chunk_overlap})")
-    chunks = chunk_docs(docs, chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap)
+    print(f"Found {len(files)} files")
     
     # Initialize embedder
-    print(f"\n[3/4] Initializing embeddings model: {args.embedding_model}")
-    embedder = get_embedder(args.embedding_model)
+    print(f"\n[2/3] Initializing embeddings model: {args.embedding_model}")
+    if args.workers > 1:
+        embedder = ParallelEmbedder(
+            args.embedding_model,
+            workers=args.workers,
+            threads_per_worker=args.threads_per_worker,
+            batch_size=args.embed_batch_size,
+            max_tokens_per_batch=args.max_tokens_per_batch
+        )
+    else:
+        embedder = get_embedder(
+            args.embedding_model,
+            batch_size=args.embed_batch_size,
+            max_tokens_per_batch=args.max_tokens_per_batch
+        )
+    
+    # Each flush has to hand every worker a full batch's worth of buckets
+    batch_size = args.batch_size * max(1, args.workers)
+    
+    # Load, chunk and embed in batches, checkpointing as we go
+    print(f"\n[3/3] Ingesting (size={args.chunk_size}, overlap={args.chunk_overlap}, "
+          f"batch={batch_size}) into: {args.store_path}")
+    try:
+        ingest_files(
+            files,
+            embedder,
+            args.store_path,
+            chunk_size=args.chunk_size,
+            chunk_overlap=args.chunk_overlap,
+            batch_size=batch_size,
+            checkpoint_every=args.checkpoint_every,
+            resume=args.resume,
+            embedding_model=args.embedding_model,
+            ocr=args.ocr,
+            ocr_workers=args.ocr_workers
+        )
+    finally:
+        if args.workers > 1:
+            embedder.close()
     
-    # Build and save vector store
-    print(f"\n[4/4] Building vector store and saving to: {args.store_path}")
-    build_store(chunks, embedder, args.store_path)
+    print(f"Embedding throughput: {embedder.throughput()}")
     
     print("\n" + "=" * 60)
     print("Ingestion complete!")
@@ -0,0 +1,137 @@
+"""
+Tests for checkpointed, resumable ingestion.
+"""
+
+import pytest
+from langchain_community.embeddings import DeterministicFakeEmbedding
+
+from app.ingestion import bulk
+from app.ingestion.bulk import ingest_files, load_manifest
+
+
+class Interrupted(Exception):
+    pass
+
+
+class InterruptingEmbedder(DeterministicFakeEmbedding):
+    """Fake embedder that fails on its N-th batch, like a crash mid-run."""
+
+    fail_on_batch: int = 0
+    batches: int = 0
+
+    def embed_documents(self, texts):
+        self.batches += 1
+        if self.batches == self.fail_on_batch:
+            raise Interrupted()
+        return super().embed_documents(texts)
+
+
+def make_corpus(directory, num_files=6):
+    files = []
+    for i in range(num_files):
+        path = directory / f"doc{i}.txt"
+        words = " ".join(f"file{i}-word{j}" for j in range(40 * (i + 1)))
+        path.write_text(words)
+        files.append(str(path))
+    return files
+
+
+def stored_chunks(store):
+    """Chunk texts and sources in index order."""
+    return [
+        (doc.metadata["source"], doc.page_content)
+        for doc in (
+            store.docstore.search(store.index_to_docstore_id[i])
+            for i in range(store.index.ntotal)
+        )
+    ]
+
+
+INGEST_KWARGS = dict(chunk_size=100, chunk_overlap=20, batch_size=4, checkpoint_every=2)
+
+
+def test_resume_matches_uninterrupted_run(tmp_path):
+    files = make_corpus(tmp_path)
+
+    reference = ingest_files(
+        files, DeterministicFakeEmbedding(size=16), str(tmp_path / "reference"), **INGEST_KWARGS
+    )
+
+    store_path = str(tmp_path / "resumed")
+    with pytest.raises(Interrupted):
+        ingest_files(files, InterruptingEmbedder(size=16, fail_on_batch=7), store_path,
+                     **INGEST_KWARGS)
+
+    manifest = load_manifest(store_path)
+    # Six batches embedded before the crash, checkpointed as three shards
+    assert manifest["chunks_done"] == 6 * INGEST_KWARGS["batch_size"]
+    assert len(manifest["shards"]) == 3
+    assert manifest["current_file"] is not None
+
+    resumed = ingest_files(
+        files, DeterministicFakeEmbedding(size=16), store_path, resume=True, **INGEST_KWARGS
+    )
+
+    assert stored_chunks(resumed) == stored_chunks(reference)
+    assert load_manifest(store_path)["complete"]
+
+
+def test_failed_files_are_retried_on_resume(tmp_path, monkeypatch):
+    files = make_corpus(tmp_path, num_files=3)
+    store_path = str(tmp_path / "store")
+    real_load_docs = bulk.load_docs
+
+    def flaky_load_docs(path, **kwargs):
+        if path == files[1]:
+            raise OSError("transient")
+        return real_load_docs(path, **kwargs)
+
+    monkeypatch.setattr(bulk, "load_docs", flaky_load_docs)
+    ingest_files(files, DeterministicFakeEmbedding(size=16), store_path, **INGEST_KWARGS)
+
+    manifest = load_manifest(store_path)
+    assert files[1] in manifest["files_failed"]
+    assert files[1] not in manifest["files_done"]
+    assert not manifest["complete"]
+
+    monkeypatch.setattr(bulk, "load_docs", real_load_docs)
+    store = ingest_files(
+        files, DeterministicFakeEmbedding(size=16), store_path, resume=True, **INGEST_KWARGS
+    )
+
+    manifest = load_manifest(store_path)
+    assert manifest["files_failed"] == {}
+    assert manifest["complete"]
+    assert {source for source, _ in stored_chunks(store)} == set(files)
+
+
+def test_files_with_failed_ocr_are_retried_from_the_start(tmp_path, monkeypatch):
+    files = make_corpus(tmp_path, num_files=3)
+    store_path = str(tmp_path / "store")
+    real_load_docs = bulk.load_docs
+
+    reference = ingest_files(
+        files, DeterministicFakeEmbedding(size=16), str(tmp_path / "reference"), **INGEST_KWARGS
+    )
+
+    def failed_ocr_load_docs(path, **kwargs):
+        docs = real_load_docs(path, **kwargs)
+        if path == files[1]:
+            docs[0].metadata["ocr_failed"] = True
+        return docs
+
+    monkeypatch.setattr(bulk, "load_docs", failed_ocr_load_docs)
+    ingest_files(files, DeterministicFakeEmbedding(size=16), store_path, **INGEST_KWARGS)
+
+    manifest = load_manifest(store_path)
+    assert "OCR failed" in manifest["files_failed"][files[1]]
+    assert files[1] not in manifest["files_done"]
+
+    monkeypatch.setattr(bulk, "load_docs", real_load_docs)
+    store = ingest_files(
+        files, DeterministicFakeEmbedding(size=16), store_path, resume=True, **INGEST_KWARGS
+    )
+
+    # Same chunks as a clean run, none stored twice
+    assert sorted(stored_chunks(store)) == sorted(stored_chunks(reference))
+    assert load_manifest(store_path)["complete"]
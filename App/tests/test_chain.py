@@ -0,0 +1,103 @@
+"""
+Tests for the concurrent map-reduce answer mode.
+"""
+
+import asyncio
+
+from langchain_core.documents import Document
+
+from app.rag.chain import generate_answer_map_reduce
+
+
+class FakeAsyncLLM:
+    """
+    Async LLM stub. Map prompts are answered per chunk text:
+    "slow" never finishes, "fail" raises, "none" has no evidence, and any
+    other text is echoed back as evidence after `delays[text]` seconds.
+    """
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.started = []
+        self.cancelled = []
+        self.reduce_prompt = None
+
+    async def ainvoke(self, prompt):
+        text = prompt.split("Text:\n", 1)[1].split("\n\nQuestion:", 1)[0]
+        self.started.append(text)
+        try:
+            if text.startswith("slow"):
+                await asyncio.sleep(60)
+            await asyncio.sleep(self.delays.get(text, 0))
+        except asyncio.CancelledError:
+            self.cancelled.append(text)
+            raise
+        if text == "fail":
+            raise ConnectionError("server went away")
+        if text == "none":
+            return "NONE"
+        return f"evidence from {text}"
+
+    async def astream(self, prompt):
+        self.reduce_prompt = prompt
+        for part in ["The ", "answer."]:
+            yield part
+
+
+def docs(*texts):
+    return [Document(page_content=text) for text in texts]
+
+
+def run(llm, texts, **kwargs):
+    return asyncio.run(generate_answer_map_reduce(llm, "question?", docs(*texts), **kwargs))
+
+
+def map_reduce_with_timeout(llm, texts, **kwargs):
+    """Fails instead of hanging if "slow" map calls are not cancelled."""
+    return asyncio.run(asyncio.wait_for(
+        generate_answer_map_reduce(llm, "question?", docs(*texts), **kwargs), timeout=5
+    ))
+
+
+def test_min_evidence_cancels_in_flight_calls():
+    llm = FakeAsyncLLM()
+
+    answer = map_reduce_with_timeout(
+        llm, ["a", "slow1", "b", "slow2"], max_concurrency=4, min_evidence=2
+    )
+
+    assert answer == "The answer."
+    assert sorted(llm.cancelled) == ["slow1", "slow2"]
+    assert "evidence from a\n\nevidence from b" in llm.reduce_prompt
+
+
+def test_min_evidence_skips_calls_not_started():
+    llm = FakeAsyncLLM()
+
+    map_reduce_with_timeout(
+        llm, ["a", "b", "slow1", "slow2", "slow3"], max_concurrency=2, min_evidence=2
+    )
+
+    # Only two calls run at once and the slow ones never finish, so slow3 never starts
+    assert "slow3" not in llm.started
+    assert sorted(llm.cancelled) == sorted(text for text in llm.started if text.startswith("slow"))
+
+
+def test_failed_map_call_counts_as_no_evidence():
+    llm = FakeAsyncLLM()
+
+    answer = run(llm, ["fail", "a", "none"], max_concurrency=3)
+
+    assert answer == "The answer."
+    notes = llm.reduce_prompt.split("Notes:\n", 1)[1].split("\n\nQuestion:", 1)[0]
+    assert notes == "evidence from a"
+
+
+def test_reduce_keeps_retrieval_order():
+    # Later chunks finish first
+    llm = FakeAsyncLLM(delays={"a": 0.03, "b": 0.02, "c": 0.01})
+
+    run(llm, ["a", "b", "c"], max_concurrency=3)
+
+    notes = llm.reduce_prompt.split("Notes:\n", 1)[1].split("\n\nQuestion:", 1)[0]
+    assert notes == "evidence from a\n\nevidence from b\n\nevidence from c"
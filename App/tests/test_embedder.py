@@ -0,0 +1,94 @@
+"""
+Tests for length-bucketed embedding.
+"""
+
+import numpy as np
+
+from app.embeddings.embedder import BucketedEmbeddings, length_batches
+
+
+def test_length_batches_caps_batch_size():
+    batches = length_batches([5] * 7, batch_size=3)
+
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert sorted(i for batch in batches for i in batch) == list(range(7))
+
+
+def test_length_batches_sorts_longest_first():
+    lengths = [3, 9, 1, 7, 5]
+
+    batches = length_batches(lengths, batch_size=2)
+
+    assert batches == [[1, 3], [4, 0], [2]]
+
+
+def test_length_batches_respects_token_budget():
+    lengths = [10, 10, 10, 10, 4, 4, 4]
+
+    batches = length_batches(lengths, batch_size=8, max_tokens_per_batch=25)
+
+    # The first input of a batch sets its padded width
+    for batch in batches:
+        assert len(batch) * lengths[batch[0]] <= 25
+    assert batches == [[0, 1], [2, 3], [4, 5, 6]]
+
+
+def test_length_batches_over_budget_input_gets_own_batch():
+    batches = length_batches([100, 10, 10], batch_size=8, max_tokens_per_batch=50)
+
+    assert batches == [[0], [1, 2]]
+
+
+class StubTokenizer:
+    def __call__(self, texts, add_special_tokens=True, truncation=False, max_length=None):
+        ids = [[0] * len(text.split()) for text in texts]
+        if truncation:
+            ids = [i[:max_length] for i in ids]
+        return {"input_ids": ids}
+
+
+class StubClient:
+    """Encodes a text as [word count, batch number] and records batch sizes."""
+
+    tokenizer = StubTokenizer()
+    max_seq_length = 6
+
+    def __init__(self):
+        self.batches = []
+
+    def encode(self, texts, batch_size, **kwargs):
+        self.batches.append(len(texts))
+        return np.array([[len(text.split()), len(self.batches)] for text in texts], dtype=float)
+
+
+class StubBase:
+    encode_kwargs = {}
+
+    def __init__(self):
+        self.client = StubClient()
+
+
+def test_embed_documents_returns_input_order():
+    texts = ["a b c", "a", "a b c d e", "a b", "a b c d"]
+    embedder = BucketedEmbeddings(StubBase(), batch_size=2)
+
+    vectors = embedder.embed_documents(texts)
+
+    assert [vector[0] for vector in vectors] == [3, 1, 5, 2, 4]
+    assert embedder.base.client.batches == [2, 2, 1]
+    assert embedder.throughput()["tokens"] == 15
+
+
+def test_embed_documents_truncates_token_counts():
+    embedder = BucketedEmbeddings(StubBase(), batch_size=2)
+
+    embedder.embed_documents(["w " * 20, "w"])
+
+    assert embedder.throughput()["tokens"] == StubClient.max_seq_length + 1
+
+
+def test_embed_documents_empty_input():
+    embedder = BucketedEmbeddings(StubBase())
+
+    assert embedder.embed_documents([]) == []
+    assert embedder.base.client.batches == []
@@ -0,0 +1,59 @@
+"""
+Tests for multi-process embedding.
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sentence_transformers")
+
+from app.embeddings.embedder import get_embedder
+from app.embeddings.parallel import ParallelEmbedder
+
+
+WORDS = [f"word{j}" for j in range(400)]
+
+
+@pytest.fixture(scope="module")
+def model_path(tmp_path_factory):
+    """A tiny randomly initialized BERT sentence encoder, so the test runs offline."""
+    import torch
+    from sentence_transformers import SentenceTransformer, models
+    from transformers import BertConfig, BertModel, BertTokenizerFast
+
+    path = tmp_path_factory.mktemp("model")
+    hf_path = path / "hf"
+    hf_path.mkdir()
+    (hf_path / "vocab.txt").write_text(
+        "\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + WORDS) + "\n"
+    )
+
+    torch.manual_seed(0)
+    BertModel(BertConfig(
+        vocab_size=len(WORDS) + 5, hidden_size=32, num_hidden_layers=2,
+        num_attention_heads=2, intermediate_size=64
+    )).save_pretrained(hf_path)
+    BertTokenizerFast(vocab_file=str(hf_path / "vocab.txt")).save_pretrained(hf_path)
+
+    transformer = models.Transformer(str(hf_path), max_seq_length=128)
+    SentenceTransformer(
+        modules=[transformer, models.Pooling(32, "mean"), models.Normalize()]
+    ).save(str(path / "st"))
+    return str(path / "st")
+
+
+def test_workers_match_serial_vectors(model_path):
+    texts = [
+        " ".join(WORDS[:length])
+        for length in (3, 180, 40, 7, 400, 12, 90, 1, 250, 60, 25, 5)
+    ]
+
+    serial = get_embedder(model_path, batch_size=4, max_tokens_per_batch=256)
+    parallel = ParallelEmbedder(model_path, workers=2, batch_size=4, max_tokens_per_batch=256)
+    try:
+        parallel_vectors = parallel.embed_documents(texts)
+    finally:
+        parallel.close()
+
+    # Same buckets, so only thread-count-dependent float rounding may differ
+    np.testing.assert_allclose(parallel_vectors, serial.embed_documents(texts), atol=1e-6)
@@ -0,0 +1,62 @@
+"""
+Tests for MMR selection and adaptive-k cutoffs.
+"""
+
+import numpy as np
+from langchain_community.embeddings import DeterministicFakeEmbedding
+from langchain_community.vectorstores import FAISS
+
+from app.rag.retriever import adaptive_cutoff, mmr_select, retrieve_with_scores
+
+
+def test_mmr_skips_duplicate_candidates():
+    query = np.array([1.0, 0.0, 0.0])
+    candidates = np.array([
+        [0.9, 0.1, 0.0],
+        [0.9, 0.1, 0.0],  # exact duplicate of the best hit
+        [0.6, 0.0, 0.8],
+    ])
+
+    assert mmr_select(query, candidates, k=2, lambda_mult=0.5) == [0, 2]
+
+
+def test_mmr_relevance_only_keeps_similarity_order():
+    query = np.array([1.0, 0.0])
+    candidates = np.array([[0.5, 0.5], [1.0, 0.1], [0.1, 1.0]])
+
+    assert mmr_select(query, candidates, k=3, lambda_mult=1.0) == [1, 0, 2]
+
+
+def test_mmr_empty_candidate_set():
+    assert mmr_select(np.array([1.0, 0.0]), np.empty((0, 2)), k=4) == []
+
+
+def test_mmr_k_larger_than_candidates():
+    candidates = np.eye(3)
+
+    assert sorted(mmr_select(np.array([1.0, 0.5, 0.2]), candidates, k=10)) == [0, 1, 2]
+
+
+def test_relative_drop_cut():
+    # Squared L2 distances over unit vectors: similarity = 1 - distance / 2
+    similarities = np.array([0.9, 0.85, 0.8, 0.4, 0.38])
+    scores = list(2 * (1 - similarities))
+
+    assert adaptive_cutoff(scores, max_relative_drop=0.3) == 3
+    assert adaptive_cutoff(scores, max_relative_drop=0.6) == 5
+    assert adaptive_cutoff(scores, min_similarity=0.82) == 2
+
+
+def test_cutoff_keeps_best_hit():
+    assert adaptive_cutoff([1.8, 1.9], min_similarity=0.9) == 1
+
+
+def test_retrieve_with_mmr_drops_duplicate_chunks():
+    texts = ["refund policy", "refund policy", "shipping times", "office hours"]
+    store = FAISS.from_texts(texts, DeterministicFakeEmbedding(size=16))
+
+    results = retrieve_with_scores("refund policy", store, k=2, mmr=True, fetch_k=4)
+
+    contents = [doc.page_content for doc, _ in results]
+    assert contents[0] == "refund policy"
+    assert len(set(contents)) == 2
@@ -0,0 +1,31 @@
+"""
+Tests for building FAISS stores of each index type.
+"""
+
+import pytest
+from langchain_community.embeddings import DeterministicFakeEmbedding
+from langchain_core.documents import Document
+
+from app.rag.retriever import retrieve_with_scores
+from app.vectorstore.faiss_store import INDEX_TYPES, build_store_from_embeddings
+
+
+@pytest.mark.parametrize("index_type", INDEX_TYPES)
+@pytest.mark.parametrize("mmr", [False, True])
+def test_index_types_build_and_retrieve(index_type, mmr):
+    embedder = DeterministicFakeEmbedding(size=16)
+    docs = [
+        Document(page_content=f"chunk number {i}", metadata={"source": f"doc{i % 5}.txt"})
+        for i in range(100)
+    ]
+    embeddings = embedder.embed_documents([doc.page_content for doc in docs])
+
+    store = build_store_from_embeddings(docs, embeddings, embedder, index_type=index_type)
+    assert store.index.ntotal == len(docs)
+
+    results = retrieve_with_scores("chunk number 42", store, k=4, mmr=mmr, fetch_k=10)
+
+    assert results
+    assert len(results) <= 4
+    # The query's own chunk is an exact match, so it ranks first either way
+    assert results[0][0].page_content == "chunk number 42"
@@ -5,9 +5,16 @@ FAISS vector store management.
 
 from pathlib import Path
 from typing import List
+
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
 
 
+INDEX_TYPES = ("flat", "hnsw", "ivf")
+
+
 def build_store(docs: List, embedder, store_path: str):
     """
     Build FAISS vector store from documents and save to disk.
@@ -67,4 +74,64 @@ def add_documents(store, docs: List):
         docs: New documents to add
     """
     store.add_documents(docs)
-    print(f"Added {len(docs)} documents to vector store")
\ No newline at end of file
+    print(f"Added {len(docs)} documents to vector store")
+
+
+def create_index(index_type: str, vectors: np.ndarray):
+    """
+    Create a FAISS index of the given type, trained on `vectors` if needed.
+    
+    Args:
+        index_type: "flat" (exact), "hnsw" or "ivf"
+        vectors: Float32 matrix of shape (n, dim) used to size and train the index
+        
+    Returns:
+        Empty (but trained) FAISS index using L2 distance, like FAISS.from_documents
+        
+    Raises:
+        ValueError: If index type is not supported
+    """
+    dim = vectors.shape[1]
+    
+    if index_type == "flat":
+        return faiss.IndexFlatL2(dim)
+    if index_type == "hnsw":
+        return faiss.IndexHNSWFlat(dim, 32)
+    if index_type == "ivf":
+        nlist = max(1, min(4096, int(np.sqrt(len(vectors)))))
+        index = faiss.IndexIVFFlat(faiss.IndexFlatL2(dim), dim, nlist)
+        index.train(vectors)
+        index.nprobe = max(1, nlist // 16)
+        # Keep ids reconstructable so MMR can fetch candidate vectors
+        index.set_direct_map_type(faiss.DirectMap.Array)
+        return index
+    
+    raise ValueError(f"Unsupported index type: {index_type}")
+
+
+def build_store_from_embeddings(docs: List, embeddings: List, embedder, index_type: str = "flat"):
+    """
+    Build FAISS vector store from precomputed embeddings.
+    
+    Args:
+        docs: List of chunked documents
+        embeddings: One embedding per document
+        embedder: Embeddings instance used for queries
+        index_type: Index type (see INDEX_TYPES)
+        
+    Returns:
+        FAISS vector store instance
+    """
+    vectors = np.asarray(embeddings, dtype="float32")
+    store = FAISS(
+        embedding_function=embedder,
+        index=create_index(index_type, vectors),
+        docstore=InMemoryDocstore(),
+        index_to_docstore_id={}
+    )
+    store.add_embeddings(
+        zip([doc.page_content for doc in docs], embeddings),
+        metadatas=[doc.metadata for doc in docs]
+    )
+    
+    return store
\ No newline at end of file